@@ -11,14 +11,35 @@ Tax Rules (Tanzania 2026):
 
 import streamlit as st
 import re
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Optional, Tuple
+import string
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 import io
-from PIL import Image
-import pytesseract
-import pdfplumber
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
 
+# The OCR stack (Pillow, pytesseract, pdfplumber) is imported lazily inside
+# OCRProcessor, and pandas inside the batch code, so manual entry doesn't pay
+# their import cost
+if TYPE_CHECKING:
+    import pandas as pd
+    from PIL import Image
+
+# Maximum number of Tesseract processes run in parallel for scanned PDF pages
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", os.cpu_count() or 1))
+
+# Longest image side passed to Tesseract (~300 dpi for an A4 page)
+OCR_MAX_DIMENSION = 2400
+
+# LSTM engine, single uniform block of text (skips page layout analysis)
+TESSERACT_CONFIG = "--oem 1 --psm 6"
+
+# PDF pages with less extractable text than this are treated as scanned
+MIN_TEXT_LAYER_CHARS = 50
+
 # Page configuration
 st.set_page_config(
     page_title="TZ Rent Invoice Processor",
@@ -28,44 +49,36 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-    <style>
-    .big-font {
-        font-size: 24px !important;
-        font-weight: bold;
-        color: #1f77b4;
-    }
-    .warning-box {
-        padding: 20px;
-        background-color: #fff3cd;
-        border-left: 5px solid #ffc107;
-        border-radius: 5px;
-        margin: 10px 0;
-    }
-    .success-box {
-        padding: 20px;
-        background-color: #d4edda;
-        border-left: 5px solid #28a745;
-        border-radius: 5px;
-        margin: 10px 0;
-    }
-    .info-box {
-        padding: 20px;
-        background-color: #d1ecf1;
-        border-left: 5px solid #17a2b8;
-        border-radius: 5px;
-        margin: 10px 0;
-    }
-    .calculation-table {
-        font-size: 16px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles.css")
+
+
+@st.cache_data(show_spinner=False)
+def _load_css() -> str:
+    """Read the app stylesheet once per process"""
+    with open(CSS_PATH, encoding="utf-8") as css_file:
+        return css_file.read()
+
+
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
 
 class InvoiceData:
     """Data class to hold parsed invoice information"""
+    
+    # Fields checked by InvoiceParser.validate_invoice; assigning any of them
+    # discards the cached validation result
+    VALIDATED_FIELDS = frozenset({'base_rent_tzs', 'vat_amount_tzs', 'total_amount_tzs'})
+    
+    # Amounts mirrored as integer cents when assigned, so the calculation and
+    # display code can use the TaxCalculator *_cents kernels directly
+    CENTS_FIELDS = {
+        'base_rent_tzs': 'base_rent_cents',
+        'vat_amount_tzs': 'vat_amount_cents',
+        'total_amount_tzs': 'total_amount_cents',
+    }
+    
     def __init__(self):
+        self._validation: Optional[Tuple[bool, list]] = None
         self.invoice_number: Optional[str] = None
         self.invoice_date: Optional[str] = None
         self.rent_period: Optional[str] = None
@@ -80,6 +93,36 @@ class InvoiceData:
         self.landlord_account: Optional[str] = None
         self.usd_equivalent: Optional[str] = None
         self.raw_text: str = ""
+    
+    def __setattr__(self, name, value):
+        if name in InvoiceData.VALIDATED_FIELDS:
+            object.__setattr__(self, '_validation', None)
+        if name in InvoiceData.CENTS_FIELDS:
+            object.__setattr__(self, InvoiceData.CENTS_FIELDS[name],
+                               None if value is None else _to_cents(value))
+        object.__setattr__(self, name, value)
+
+
+def _to_cents(amount: Decimal) -> int:
+    """Convert a TZS amount to integer cents, rounding half-up"""
+    return int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+_CENT = Decimal("0.01")
+
+
+def _from_cents(cents: int) -> Decimal:
+    """Convert integer cents back to a 2-decimal-place TZS amount"""
+    # Exact: the product has exponent -2 and fits the 28-digit context
+    return Decimal(cents) * _CENT
+
+
+def _div_half_up(numerator: int, denominator: int) -> int:
+    """Integer division rounding half away from zero (matches ROUND_HALF_UP)"""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
 
 
 class TaxCalculator:
@@ -88,12 +131,34 @@ class TaxCalculator:
     WHT_RATE = Decimal("0.10")  # 10% withholding tax
     VAT_RATE_STANDARD = Decimal("0.18")  # 18% standard VAT rate
     
+    _WHT_RATIO = WHT_RATE.as_integer_ratio()
+    _VAT_STANDARD_BP = int(VAT_RATE_STANDARD * 10000)  # basis points
+    _VAT_TOLERANCE_BP = 100  # ±1%
+    
+    # Largest per-invoice amount calculate_batch accepts: keeps the int64
+    # intermediates (2 * gross * WHT numerator, gross + VAT) from overflowing
+    BATCH_MAX_CENTS = (2**63 - 1) // (4 * _WHT_RATIO[0])
+    
+    @staticmethod
+    def calculate_wht_cents(gross_cents: int) -> int:
+        """Calculate 10% WHT on gross rent, in integer cents"""
+        numerator, denominator = TaxCalculator._WHT_RATIO
+        return _div_half_up(gross_cents * numerator, denominator)
+    
+    @staticmethod
+    def calculate_payment_to_landlord_cents(gross_cents: int, vat_cents: int, wht_cents: int) -> int:
+        """Calculate net payment to landlord in integer cents: (Gross Rent - WHT) + VAT"""
+        return (gross_cents - wht_cents) + vat_cents
+    
+    @staticmethod
+    def calculate_total_outflow_cents(payment_cents: int, wht_cents: int) -> int:
+        """Calculate total tenant outflow in integer cents"""
+        return payment_cents + wht_cents
+    
     @staticmethod
     def calculate_wht(gross_rent: Decimal) -> Decimal:
         """Calculate 10% WHT on gross rent (before VAT)"""
-        return (gross_rent * TaxCalculator.WHT_RATE).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
+        return _from_cents(TaxCalculator.calculate_wht_cents(_to_cents(gross_rent)))
     
     @staticmethod
     def calculate_payment_to_landlord(
@@ -102,151 +167,305 @@ class TaxCalculator:
         wht: Decimal
     ) -> Decimal:
         """Calculate net payment to landlord: (Gross Rent - WHT) + VAT"""
-        return ((gross_rent - wht) + vat_amount).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
+        return _from_cents(TaxCalculator.calculate_payment_to_landlord_cents(
+            _to_cents(gross_rent), _to_cents(vat_amount), _to_cents(wht)
+        ))
     
     @staticmethod
     def calculate_total_outflow(payment_to_landlord: Decimal, wht: Decimal) -> Decimal:
         """Calculate total tenant outflow"""
-        return (payment_to_landlord + wht).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        )
+        return _from_cents(TaxCalculator.calculate_total_outflow_cents(
+            _to_cents(payment_to_landlord), _to_cents(wht)
+        ))
     
     @staticmethod
-    def verify_vat_rate(vat_amount: Decimal, base_amount: Decimal) -> Tuple[Decimal, bool]:
-        """Verify and calculate effective VAT rate"""
-        if base_amount == 0:
-            return Decimal("0"), False
+    def calculate_batch(invoices: "pd.DataFrame") -> "pd.DataFrame":
+        """
+        Calculate WHT and payment splits for many invoices at once.
         
-        effective_rate = (vat_amount / base_amount).quantize(
-            Decimal("0.0001"), rounding=ROUND_HALF_UP
-        )
+        Expects int64 columns 'gross_cents' and 'vat_cents' (each at most
+        BATCH_MAX_CENTS); returns int64 columns 'wht_cents',
+        'payment_to_landlord_cents' and 'total_outflow_cents'.
+        """
+        import pandas as pd
         
-        # Check if rate is close to 18%
-        is_standard = abs(effective_rate - TaxCalculator.VAT_RATE_STANDARD) < Decimal("0.01")
+        gross = invoices['gross_cents'].to_numpy(dtype='int64')
+        vat = invoices['vat_cents'].to_numpy(dtype='int64')
         
-        return effective_rate, is_standard
+        # Half-up rounding of gross * WHT_RATE (amounts are non-negative)
+        numerator, denominator = TaxCalculator._WHT_RATIO
+        wht = (2 * gross * numerator + denominator) // (2 * denominator)
+        payment_to_landlord = (gross - wht) + vat
+        
+        return pd.DataFrame({
+            'wht_cents': wht,
+            'payment_to_landlord_cents': payment_to_landlord,
+            'total_outflow_cents': payment_to_landlord + wht,
+        }, index=invoices.index)
+    
+    @staticmethod
+    def verify_vat_rate_cents(vat_cents: int, base_cents: int) -> Tuple[int, bool]:
+        """Effective VAT rate in basis points (0.01%), and whether it is within 1% of 18%"""
+        if base_cents == 0:
+            return 0, False
+        
+        if base_cents < 0:
+            vat_cents, base_cents = -vat_cents, -base_cents
+        rate_bp = _div_half_up(vat_cents * 10000, base_cents)
+        
+        # Integer compare; no Decimal division needed to classify the rate
+        return rate_bp, abs(rate_bp - TaxCalculator._VAT_STANDARD_BP) < TaxCalculator._VAT_TOLERANCE_BP
+    
+    @staticmethod
+    def verify_vat_rate(vat_amount: Decimal, base_amount: Decimal) -> Tuple[Decimal, bool]:
+        """Verify and calculate effective VAT rate"""
+        rate_bp, is_standard = TaxCalculator.verify_vat_rate_cents(
+            _to_cents(vat_amount), _to_cents(base_amount)
+        )
+        return Decimal(rate_bp).scaleb(-4), is_standard
 
 
 class OCRProcessor:
     """Handles OCR extraction from images and PDFs"""
     
     @staticmethod
-    def extract_from_image(image: Image.Image) -> str:
-        """Extract text from image using Tesseract OCR"""
-        try:
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Use pytesseract to extract text
-            text = pytesseract.image_to_string(image, lang='eng')
-            return text
-        except Exception as e:
-            st.error(f"OCR Error: {str(e)}")
-            return ""
+    def _image_to_text(image: "Image.Image") -> str:
+        """Run Tesseract OCR on a PIL image"""
+        from PIL import Image, ImageOps
+        import pytesseract
+        
+        # Single-channel grayscale: a third of the bytes of RGB, and what
+        # Tesseract works on internally anyway
+        if image.mode not in ('L', '1'):
+            image = image.convert('L')
+        
+        # Downsample large photos; Tesseract time scales with pixel count
+        scale = min(1.0, OCR_MAX_DIMENSION / max(image.size))
+        if scale < 1.0:
+            width, height = image.size
+            image = image.resize((int(width * scale), int(height * scale)), Image.LANCZOS)
+        
+        # Stretch contrast; Tesseract does its own (Otsu) binarization
+        if image.mode == 'L':
+            image = ImageOps.autocontrast(image)
+        
+        return pytesseract.image_to_string(image, lang='eng', config=TESSERACT_CONFIG)
+    
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def extract_from_image(image_bytes: bytes) -> str:
+        """
+        Extract text from image bytes using Tesseract OCR (cached per file).
+        
+        Errors propagate so that a failed run is not cached for the file.
+        """
+        from PIL import Image
+        
+        image = Image.open(io.BytesIO(image_bytes))
+        
+        # Decode JPEGs straight to grayscale, and let the decoder downscale
+        # by 1/2, 1/4 or 1/8 when the longest side is at least twice
+        # OCR_MAX_DIMENSION. draft() keeps both sides >= the requested size,
+        # so ask for the image scaled down to OCR_MAX_DIMENSION on its
+        # longest side rather than a square box.
+        if image.format == 'JPEG':
+            width, height = image.size
+            scale = OCR_MAX_DIMENSION / max(width, height)
+            if scale < 1:
+                image.draft('L', (math.ceil(width * scale), math.ceil(height * scale)))
+            else:
+                image.draft('L', image.size)
+        
+        return OCRProcessor._image_to_text(image)
     
     @staticmethod
-    def extract_from_pdf(pdf_file) -> str:
-        """Extract text from PDF using pdfplumber"""
-        try:
-            text = ""
-            with pdfplumber.open(pdf_file) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n\n"
-            return text
-        except Exception as e:
-            st.error(f"PDF Extraction Error: {str(e)}")
-            return ""
+    @st.cache_data(show_spinner=False)
+    def _ocr_pdf_page(pdf_bytes: bytes, page_index: int) -> str:
+        """Render one PDF page at 300 dpi and OCR it (cached per file and page; failures are not cached)"""
+        import pdfplumber
+        
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            image = pdf.pages[page_index].to_image(resolution=300).original
+        return OCRProcessor._image_to_text(image)
+    
+    @staticmethod
+    @st.cache_data(show_spinner=False)
+    def extract_from_pdf(pdf_bytes: bytes) -> Tuple[str, list]:
+        """
+        Extract text from PDF bytes with a single PDFMiner pass, OCR-ing scanned
+        pages (cached per file).
+        
+        Returns the text and a list of pages that could not be OCR'd; those
+        pages keep their text-layer text. Other errors propagate, so a failed
+        run is not cached for the file.
+        """
+        from pdfminer.high_level import extract_text
+        from pdfminer.layout import LAParams
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+        
+        # Wide char_margin keeps a label and its right-aligned amount on one
+        # line; boxes_flow=None skips column detection invoices don't need
+        laparams = LAParams(line_margin=0.3, char_margin=100.0, boxes_flow=None)
+        text = extract_text(io.BytesIO(pdf_bytes), laparams=laparams)
+        # PDFMiner separates pages with form feeds and text boxes with blank lines
+        page_texts = [page_text.replace("\n\n", "\n").strip() for page_text in text.split("\f")]
+        if text.endswith("\f"):
+            page_texts.pop()
+        
+        # No usable text layer (scanned page): OCR it
+        scanned_pages = [i for i, page_text in enumerate(page_texts)
+                         if len(page_text) < MIN_TEXT_LAYER_CHARS]
+        failures = []
+        if scanned_pages:
+            # Tesseract runs as a separate process per call, so scanned pages
+            # can be recognised concurrently. Each worker renders its own page,
+            # so at most `workers` 300 dpi bitmaps are held at once, and pages
+            # that were recognised before come from the per-page cache.
+            workers = max(1, min(OCR_CONCURRENCY, len(scanned_pages)))
+            with ThreadPoolExecutor(max_workers=workers, initializer=add_script_run_ctx,
+                                    initargs=(None, get_script_run_ctx())) as executor:
+                futures = {i: executor.submit(OCRProcessor._ocr_pdf_page, pdf_bytes, i)
+                           for i in scanned_pages}
+                for i, future in futures.items():
+                    try:
+                        page_texts[i] = future.result()
+                    except Exception as e:
+                        # Keep whatever the text layer had for this page
+                        failures.append(f"page {i + 1}: {e}")
+        
+        return "\n\n".join(page_text for page_text in page_texts if page_text), failures
+
+# Regex backend for invoice parsing: the standard library `re` by default.
+# Set USE_RE2=1 to use Google RE2 when installed -- linear time and immune to
+# catastrophic backtracking, but about 3x slower on a normal invoice; it only
+# pays off on very large, noisy OCR output.
+_regex = re
+if os.getenv("USE_RE2", "0") == "1":
+    try:
+        import re2 as _regex
+    except ImportError:
+        pass
+
+
+def _compile(pattern: str):
+    """Compile an invoice pattern with the active regex backend"""
+    return _regex.compile(pattern)
+
+
+# Text normalisation applied once per parse: CRLF, CR, vertical tab and form
+# feed line breaks become LF, other control characters (except tab) are
+# dropped, and runs of spaces/tabs collapse to one space.
+# Patterns are written in upper case and matched case-sensitively against an
+# ASCII-upper-cased copy -- much faster than IGNORECASE with `re`, and the
+# copy has the same length, so match offsets slice straight into the
+# original-case text.
+CONTROL_CHARS = {
+    **dict.fromkeys([*range(0, 9), *range(14, 32), 127]),
+    **dict.fromkeys(map(ord, '\v\f\r'), '\n'),
+}
+SPACE_RUN_RE = re.compile(r'\t[ \t]*| [ \t]+')  # single spaces are left alone
+ASCII_UPPER = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+
+# Translation table that strips thousands separators
+NO_COMMA = str.maketrans('', '', ',')
+
+# Invoice parsing patterns, compiled once at import time
+INV_NUM_RES = tuple(_compile(p) for p in (
+    r'INVOICE\s*(?:NO|NUMBER|#)[:\s]*([A-Z0-9\-/]+)',
+    r'INV[:\s]*([A-Z0-9\-/]+)',
+))
+DATE_RES = tuple(_compile(p) for p in (
+    r'DATE[:\s]*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})',
+    r'(\d{1,2}\s+(?:JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)[A-Z]*\s+\d{4})',
+))
+PERIOD_RES = tuple(_compile(p) for p in (
+    r'(?:PERIOD|MONTH|FOR)[:\s]*([A-Z]+\s+\d{4})',
+    r'RENT\s+FOR[:\s]*([A-Z]+\s+\d{4})',
+))
+DESC_RES = tuple(_compile(p) for p in (
+    r'DESCRIPTION[:\s]*([^\n]+)',
+    r'(?:OFFICE|SHOP|COMMERCIAL)\s+(?:RENT|LEASE)[^\n]*',
+))
+# Matched against the comma-stripped copy of the text
+AMOUNT_RE = _compile(r'(?:TZS|TSH)\s*(\d+(?:\.\d{2})?)|(\d+(?:\.\d{2})?)\s*(?:TZS|TSH)')
+VAT_RES = tuple(_compile(p) for p in (
+    r'VAT\s*(?:@\s*)?(\d+)%[:\s]*(?:TZS|TSH)?\s*([0-9,]+(?:\.\d{2})?)',
+    r'(?:TZS|TSH)?\s*([0-9,]+(?:\.\d{2})?)\s*VAT',
+))
+LANDLORD_RES = tuple(_compile(p) for p in (
+    r'(?:PAYEE|LANDLORD|COMPANY)[:\s]*([^\n]+)',
+    r'([A-Z][A-Z]+(?:\s+[A-Z][A-Z]+)*\s+(?:LTD|LIMITED|COMPANY|CO\.))',
+))
+TIN_RES = tuple(_compile(p) for p in (
+    r'TIN[:\s]*(\d{9,10})',
+    r'TAX\s+ID[:\s]*(\d{9,10})',
+))
+BANK_NAME_RE = _compile(r'BANK[:\s]*([^\n]+)')
+BANK_ACCOUNT_RE = _compile(r'ACCOUNT[:\s]*([0-9\-]+)')
+USD_RE = _compile(r'USD\s*([0-9,]+(?:\.\d{2})?)')
+
+
+def _field_setter(attr: str, group: int = 1):
+    """Build a handler that stores a matched group (original case, stripped) on the invoice"""
+    def setter(invoice: InvoiceData, text: str, match):
+        setattr(invoice, attr, text[match.start(group):match.end(group)].strip())
+    return setter
+
+
+def _set_vat(invoice: InvoiceData, text: str, match):
+    """Store VAT rate (when captured) and VAT amount on the invoice"""
+    if len(match.groups()) == 2:
+        invoice.vat_rate = Decimal(match.group(1)) / 100
+        invoice.vat_amount_tzs = Decimal(match.group(2).translate(NO_COMMA))
+    else:
+        invoice.vat_amount_tzs = Decimal(match.group(1).translate(NO_COMMA))
+
+
+# Single-valued fields: patterns in priority order and the handler that
+# stores the first match on the invoice
+FIELD_RULES = (
+    (INV_NUM_RES, _field_setter('invoice_number')),
+    (DATE_RES, _field_setter('invoice_date')),
+    (PERIOD_RES, _field_setter('rent_period')),
+    (DESC_RES, _field_setter('description', 0)),
+    (VAT_RES, _set_vat),
+    (LANDLORD_RES, _field_setter('landlord_name')),
+    (TIN_RES, _field_setter('landlord_tin')),
+    ((BANK_NAME_RE,), _field_setter('landlord_bank')),
+    ((BANK_ACCOUNT_RE,), _field_setter('landlord_account')),
+    ((USD_RE,), _field_setter('usd_equivalent', 0)),
+)
 
 
 class InvoiceParser:
     """Parses invoice text to extract relevant information"""
     
     @staticmethod
+    @st.cache_data(show_spinner=False)
     def parse_invoice(raw_text: str) -> InvoiceData:
-        """Parse invoice text and extract key information"""
+        """Parse invoice text and extract key information (cached per text)"""
         invoice = InvoiceData()
         invoice.raw_text = raw_text
         
-        # Extract invoice number
-        inv_num_patterns = [
-            r'Invoice\s*(?:No|Number|#)[:\s]*([A-Z0-9\-/]+)',
-            r'INV[:\s]*([A-Z0-9\-/]+)',
-        ]
-        for pattern in inv_num_patterns:
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                invoice.invoice_number = match.group(1).strip()
-                break
-        
-        # Extract dates
-        date_patterns = [
-            r'Date[:\s]*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})',
-            r'(\d{1,2}\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})',
-        ]
-        for pattern in date_patterns:
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                invoice.invoice_date = match.group(1).strip()
-                break
-        
-        # Extract rent period
-        period_patterns = [
-            r'(?:Period|Month|For)[:\s]*([A-Za-z]+\s+\d{4})',
-            r'Rent\s+for[:\s]*([A-Za-z]+\s+\d{4})',
-        ]
-        for pattern in period_patterns:
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                invoice.rent_period = match.group(1).strip()
-                break
-        
-        # Extract description
-        desc_patterns = [
-            r'Description[:\s]*([^\n]+)',
-            r'(?:Office|Shop|Commercial)\s+(?:Rent|Lease)[^\n]*',
-        ]
-        for pattern in desc_patterns:
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                invoice.description = match.group(0).strip()
-                break
+        # Normalise once, then match against upper-cased / comma-free copies
+        text = SPACE_RUN_RE.sub(' ', raw_text.replace('\r\n', '\n').translate(CONTROL_CHARS))
+        upper = text.translate(ASCII_UPPER)
+        
+        # Extract single-valued fields (first matching pattern wins)
+        for patterns, handler in FIELD_RULES:
+            for rx in patterns:
+                match = rx.search(upper)
+                if match:
+                    handler(invoice, text, match)
+                    break
         
         # Extract amounts (TZS)
-        amount_patterns = [
-            r'(?:TZS|TSh|Tsh)\s*([0-9,]+(?:\.\d{2})?)',
-            r'([0-9,]+(?:\.\d{2})?)\s*(?:TZS|TSh)',
+        # (one scan; currency either before or after the number, in document order)
+        amounts = [
+            Decimal(match.group(1) or match.group(2))
+            for match in AMOUNT_RE.finditer(upper.translate(NO_COMMA))
         ]
         
-        amounts = []
-        for pattern in amount_patterns:
-            matches = re.finditer(pattern, raw_text, re.IGNORECASE)
-            for match in matches:
-                amount_str = match.group(1).replace(',', '')
-                try:
-                    amounts.append(Decimal(amount_str))
-                except:
-                    continue
-        
-        # Extract VAT information
-        vat_patterns = [
-            r'VAT\s*(?:@\s*)?(\d+)%[:\s]*(?:TZS|TSh)?\s*([0-9,]+(?:\.\d{2})?)',
-            r'(?:TZS|TSh)?\s*([0-9,]+(?:\.\d{2})?)\s*VAT',
-        ]
-        for pattern in vat_patterns:
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                if len(match.groups()) == 2:
-                    invoice.vat_rate = Decimal(match.group(1)) / 100
-                    invoice.vat_amount_tzs = Decimal(match.group(2).replace(',', ''))
-                else:
-                    invoice.vat_amount_tzs = Decimal(match.group(1).replace(',', ''))
-                break
-        
         # Try to identify base rent, VAT, and total from amounts
         if len(amounts) >= 2:
             # Assume last amount is total, second to last might be VAT
@@ -259,52 +478,21 @@ class InvoiceParser:
             if invoice.total_amount_tzs and invoice.vat_amount_tzs:
                 invoice.base_rent_tzs = invoice.total_amount_tzs - invoice.vat_amount_tzs
         
-        # Extract landlord information
-        landlord_patterns = [
-            r'(?:Payee|Landlord|Company)[:\s]*([^\n]+)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:Ltd|Limited|Company|Co\.))',
-        ]
-        for pattern in landlord_patterns:
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                invoice.landlord_name = match.group(1).strip()
-                break
-        
-        # Extract TIN
-        tin_patterns = [
-            r'TIN[:\s]*(\d{9,10})',
-            r'Tax\s+ID[:\s]*(\d{9,10})',
-        ]
-        for pattern in tin_patterns:
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                invoice.landlord_tin = match.group(1).strip()
-                break
-        
-        # Extract bank details
-        bank_patterns = [
-            r'Bank[:\s]*([^\n]+)',
-            r'Account[:\s]*([0-9\-]+)',
-        ]
-        for i, pattern in enumerate(bank_patterns):
-            match = re.search(pattern, raw_text, re.IGNORECASE)
-            if match:
-                if i == 0:
-                    invoice.landlord_bank = match.group(1).strip()
-                else:
-                    invoice.landlord_account = match.group(1).strip()
-        
-        # Extract USD equivalent if present
-        usd_pattern = r'USD\s*([0-9,]+(?:\.\d{2})?)'
-        match = re.search(usd_pattern, raw_text, re.IGNORECASE)
-        if match:
-            invoice.usd_equivalent = match.group(0).strip()
+        # Validate inline so the result is cached along with the parsed invoice
+        InvoiceParser.validate_invoice(invoice)
         
         return invoice
     
     @staticmethod
     def validate_invoice(invoice: InvoiceData) -> Tuple[bool, list]:
-        """Validate that required fields are present"""
+        """Validate that required fields are present (cached until an amount changes)"""
+        if invoice._validation is None:
+            invoice._validation = InvoiceParser._check_amounts(invoice)
+        return invoice._validation
+    
+    @staticmethod
+    def _check_amounts(invoice: InvoiceData) -> Tuple[bool, list]:
+        """Check that amounts are present, positive and consistent"""
         errors = []
         
         if not invoice.base_rent_tzs or invoice.base_rent_tzs <= 0:
@@ -329,41 +517,49 @@ class InvoiceParser:
         return len(errors) == 0, errors
 
 
+@lru_cache(maxsize=1024)
 def format_currency(amount: Decimal, currency: str = "TZS") -> str:
-    """Format currency with proper thousand separators"""
+    """Format currency with proper thousand separators (memoized; amounts repeat across a render)"""
     return f"{currency} {amount:,.2f}"
 
 
+HOW_IT_WORKS_MD = """
+**Tax Treatment for Commercial Rent:**
+
+1. **VAT (Value Added Tax):** 18% standard rate on commercial rent
+2. **WHT (Withholding Tax):** 10% of gross rent (before VAT) - withheld by tenant
+3. **Payment Split:**
+   - To Landlord: (Gross Rent - WHT) + VAT
+   - To TRA: WHT amount (remit within 7 days after month end)
+
+**Example:**
+- Base Rent: TZS 5,000,000
+- VAT @ 18%: TZS 900,000
+- Total Invoice: TZS 5,900,000
+
+**Calculations:**
+- WHT (10% of base): TZS 500,000
+- Pay to Landlord: (5,000,000 - 500,000) + 900,000 = **TZS 5,400,000**
+- Remit to TRA: **TZS 500,000**
+- Total Outflow: TZS 5,900,000 ✓
+"""
+
+
+HEADER_TITLE_HTML = '<p class="big-font">🏢 Tanzanian Commercial Rent Invoice Processor</p>'
+
+HEADER_MD = """
+This tool automatically calculates **Withholding Tax (WHT)** obligations and payment splits 
+for Tanzanian commercial rent invoices in compliance with TRA regulations.
+"""
+
+
 def display_header():
     """Display app header"""
-    st.markdown('<p class="big-font">🏢 Tanzanian Commercial Rent Invoice Processor</p>', 
-                unsafe_allow_html=True)
-    st.markdown("""
-    This tool automatically calculates **Withholding Tax (WHT)** obligations and payment splits 
-    for Tanzanian commercial rent invoices in compliance with TRA regulations.
-    """)
+    st.markdown(HEADER_TITLE_HTML, unsafe_allow_html=True)
+    st.markdown(HEADER_MD)
     
     with st.expander("ℹ️ How it works (Tanzania Tax Rules 2026)"):
-        st.markdown("""
-        **Tax Treatment for Commercial Rent:**
-        
-        1. **VAT (Value Added Tax):** 18% standard rate on commercial rent
-        2. **WHT (Withholding Tax):** 10% of gross rent (before VAT) - withheld by tenant
-        3. **Payment Split:**
-           - To Landlord: (Gross Rent - WHT) + VAT
-           - To TRA: WHT amount (remit within 7 days after month end)
-        
-        **Example:**
-        - Base Rent: TZS 5,000,000
-        - VAT @ 18%: TZS 900,000
-        - Total Invoice: TZS 5,900,000
-        
-        **Calculations:**
-        - WHT (10% of base): TZS 500,000
-        - Pay to Landlord: (5,000,000 - 500,000) + 900,000 = **TZS 5,400,000**
-        - Remit to TRA: **TZS 500,000**
-        - Total Outflow: TZS 5,900,000 ✓
-        """)
+        st.markdown(HOW_IT_WORKS_MD)
 
 
 def manual_input_form() -> Optional[InvoiceData]:
@@ -484,11 +680,12 @@ def display_extracted_data(invoice: InvoiceData):
             st.metric("VAT Amount", format_currency(invoice.vat_amount_tzs))
             
             if invoice.base_rent_tzs:
-                effective_rate, is_standard = TaxCalculator.verify_vat_rate(
-                    invoice.vat_amount_tzs, 
-                    invoice.base_rent_tzs
+                rate_bp, is_standard = TaxCalculator.verify_vat_rate_cents(
+                    invoice.vat_amount_cents,
+                    invoice.base_rent_cents
                 )
-                rate_display = f"{effective_rate * 100:.1f}%"
+                # Basis points -> 2-dp percentage, only for display
+                rate_display = f"{Decimal(rate_bp) * _CENT:.1f}%"
                 if not is_standard:
                     st.warning(f"⚠️ VAT rate appears to be {rate_display}, not standard 18%")
                 else:
@@ -506,18 +703,20 @@ def calculate_and_display_taxes(invoice: InvoiceData):
     """Calculate and display tax breakdown"""
     st.subheader("🧮 Tax Calculations & Payment Breakdown")
     
-    # Calculate WHT
-    wht_amount = TaxCalculator.calculate_wht(invoice.base_rent_tzs)
-    
-    # Calculate payment to landlord
-    payment_to_landlord = TaxCalculator.calculate_payment_to_landlord(
-        invoice.base_rent_tzs,
-        invoice.vat_amount_tzs,
-        wht_amount
+    # Integer-cent kernels on the amounts stored at parse/entry time;
+    # Decimals are only built for display
+    gross_cents = invoice.base_rent_cents
+    wht_cents = TaxCalculator.calculate_wht_cents(gross_cents)
+    payment_cents = TaxCalculator.calculate_payment_to_landlord_cents(
+        gross_cents, invoice.vat_amount_cents, wht_cents
     )
+    total_outflow_cents = TaxCalculator.calculate_total_outflow_cents(payment_cents, wht_cents)
+    mismatch_cents = abs(total_outflow_cents - invoice.total_amount_cents)
     
-    # Calculate total outflow
-    total_outflow = TaxCalculator.calculate_total_outflow(payment_to_landlord, wht_amount)
+    wht_amount = _from_cents(wht_cents)
+    net_rent = _from_cents(gross_cents - wht_cents)
+    payment_to_landlord = _from_cents(payment_cents)
+    total_outflow = _from_cents(total_outflow_cents)
     
     # Display calculation breakdown
     st.markdown('<div class="info-box">', unsafe_allow_html=True)
@@ -526,8 +725,8 @@ def calculate_and_display_taxes(invoice: InvoiceData):
     1. **Gross Rent (Base):** {format_currency(invoice.base_rent_tzs)}
     2. **VAT @ 18%:** {format_currency(invoice.vat_amount_tzs)}
     3. **Withholding Tax (10% of Base):** {format_currency(wht_amount)}
-    4. **Net Rent to Landlord:** {format_currency(invoice.base_rent_tzs)} - {format_currency(wht_amount)} = {format_currency(invoice.base_rent_tzs - wht_amount)}
-    5. **Total to Landlord:** {format_currency(invoice.base_rent_tzs - wht_amount)} + {format_currency(invoice.vat_amount_tzs)} = {format_currency(payment_to_landlord)}
+    4. **Net Rent to Landlord:** {format_currency(invoice.base_rent_tzs)} - {format_currency(wht_amount)} = {format_currency(net_rent)}
+    5. **Total to Landlord:** {format_currency(net_rent)} + {format_currency(invoice.vat_amount_tzs)} = {format_currency(payment_to_landlord)}
     """)
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -556,12 +755,12 @@ def calculate_and_display_taxes(invoice: InvoiceData):
             "Total Cash Outflow",
             format_currency(total_outflow),
             delta=f"Matches invoice: {format_currency(invoice.total_amount_tzs)}" 
-                  if abs(total_outflow - invoice.total_amount_tzs) < Decimal("0.10") 
+                  if mismatch_cents < 10 
                   else "⚠️ Mismatch!"
         )
     
     # Verification
-    if abs(total_outflow - invoice.total_amount_tzs) > Decimal("0.10"):
+    if mismatch_cents > 10:
         st.error(f"⚠️ **Verification Failed:** Total outflow ({format_currency(total_outflow)}) "
                 f"does not match invoice total ({format_currency(invoice.total_amount_tzs)}). "
                 f"Please verify the input amounts.")
@@ -571,6 +770,32 @@ def calculate_and_display_taxes(invoice: InvoiceData):
     return payment_to_landlord, wht_amount, total_outflow
 
 
+LANDLORD_PAYMENT_MD = """
+**Amount:** {amount}
+
+**Payee Details:**
+{payee_details}
+
+**Reference:** {reference}
+"""
+
+TRA_PAYMENT_MD = """
+**Amount:** {amount}
+
+**Payment Method:**
+- Use TRA's online portal or authorized bank
+- Payment Type: Withholding Tax on Rent
+- Tax Code: Typically use Income Tax code for rent WHT
+
+**Deadline:** Within 7 days after the end of the month
+
+**Documentation:**
+- Obtain WHT certificate from TRA system
+- Keep proof of payment for your records
+- Provide WHT certificate to landlord for their tax filing
+"""
+
+
 def display_payment_instructions(invoice: InvoiceData, payment_to_landlord: Decimal, wht_amount: Decimal):
     """Display detailed payment instructions"""
     st.markdown("---")
@@ -579,78 +804,157 @@ def display_payment_instructions(invoice: InvoiceData, payment_to_landlord: Deci
     # Payment to Landlord
     st.markdown('<div class="success-box">', unsafe_allow_html=True)
     st.markdown("### 1️⃣ Transfer to Landlord")
-    st.markdown(f"""
-    **Amount:** {format_currency(payment_to_landlord)}
-    
-    **Payee Details:**
-    - Name: {invoice.landlord_name or "As per invoice"}
-    {f"- TIN: {invoice.landlord_tin}" if invoice.landlord_tin else ""}
-    {f"- Bank: {invoice.landlord_bank}" if invoice.landlord_bank else ""}
-    {f"- Account: {invoice.landlord_account}" if invoice.landlord_account else ""}
-    
-    **Reference:** {invoice.invoice_number or "Invoice payment"} - {invoice.rent_period or "Rent payment"}
-    """)
+    payee_details = "\n".join(
+        f"- {label}: {value}" for label, value in (
+            ("Name", invoice.landlord_name or "As per invoice"),
+            ("TIN", invoice.landlord_tin),
+            ("Bank", invoice.landlord_bank),
+            ("Account", invoice.landlord_account),
+        ) if value
+    )
+    st.markdown(LANDLORD_PAYMENT_MD.format_map({
+        "amount": format_currency(payment_to_landlord),
+        "payee_details": payee_details,
+        "reference": f"{invoice.invoice_number or 'Invoice payment'} - {invoice.rent_period or 'Rent payment'}",
+    }))
     st.markdown('</div>', unsafe_allow_html=True)
     
     # Payment to TRA
     st.markdown('<div class="success-box">', unsafe_allow_html=True)
     st.markdown("### 2️⃣ Remit WHT to TRA")
-    st.markdown(f"""
-    **Amount:** {format_currency(wht_amount)}
-    
-    **Payment Method:**
-    - Use TRA's online portal or authorized bank
-    - Payment Type: Withholding Tax on Rent
-    - Tax Code: Typically use Income Tax code for rent WHT
-    
-    **Deadline:** Within 7 days after the end of the month
-    
-    **Documentation:**
-    - Obtain WHT certificate from TRA system
-    - Keep proof of payment for your records
-    - Provide WHT certificate to landlord for their tax filing
-    """)
+    st.markdown(TRA_PAYMENT_MD.format(amount=format_currency(wht_amount)))
     st.markdown('</div>', unsafe_allow_html=True)
 
 
+COMPLIANCE_MD = """
+1. **Landlord Residency:** This calculation assumes a **resident landlord**. Non-resident landlords 
+   may have different WHT rates. Verify landlord's tax residency status.
+
+2. **TIN Validation:** Always verify the landlord's TIN with TRA to ensure they're properly registered.
+
+3. **Service Charges:** If the invoice includes service charges (cleaning, security, etc.), these may 
+   also be subject to 10% WHT as separate items.
+
+4. **VAT Registration:** Confirm the landlord is VAT-registered and the VAT shown is legitimate. 
+   Request VAT certificate if needed.
+
+5. **WHT Certificate:** After remitting WHT to TRA, obtain and provide the WHT certificate to the 
+   landlord within the required timeframe.
+
+6. **Record Keeping:** Maintain copies of:
+   - Original invoice
+   - Bank transfer receipts
+   - TRA payment confirmation
+   - WHT certificates
+
+7. **Monthly Returns:** Remember to file your monthly WHT return with TRA, declaring all rent payments.
+
+8. **Professional Advice:** This tool provides calculations only. For complex situations or large 
+   amounts, consult a qualified tax accountant or advisor.
+
+9. **Residential vs Commercial:** These rules apply to **commercial** rent only. Residential rent 
+   has different tax treatment in Tanzania.
+
+10. **Exchange Rates:** If invoice shows USD equivalent, use TRA's official exchange rate for the 
+    transaction date if you need to report in foreign currency.
+"""
+
+
 def display_compliance_warnings():
     """Display compliance warnings and reminders"""
     st.markdown("---")
     st.markdown('<div class="warning-box">', unsafe_allow_html=True)
     st.markdown("### ⚠️ Important Compliance Reminders")
-    st.markdown("""
-    1. **Landlord Residency:** This calculation assumes a **resident landlord**. Non-resident landlords 
-       may have different WHT rates. Verify landlord's tax residency status.
+    st.markdown(COMPLIANCE_MD)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def _parse_cents(value) -> Optional[int]:
+    """Parse a CSV amount in TZS to integer cents; None if missing, invalid, negative or too large"""
+    if not isinstance(value, str):
+        return None  # empty cell
+    try:
+        amount = Decimal(value.strip().translate(NO_COMMA))
+        if not amount.is_finite() or amount < 0:
+            return None
+        cents = _to_cents(amount)
+    except InvalidOperation:  # not a number, or too many digits to quantize
+        return None
+    return cents if cents <= TaxCalculator.BATCH_MAX_CENTS else None
+
+
+def batch_processing_form():
+    """Process a CSV of invoices in a single vectorized calculation"""
+    st.subheader("📊 Batch Invoice Processing")
+    st.markdown(
+        "Upload a CSV with one invoice per row and the columns `base_rent` and "
+        "`vat_amount` (in TZS). Other columns, such as `invoice_number` or "
+        "`landlord_name`, are carried through to the results."
+    )
+    
+    uploaded_csv = st.file_uploader("Choose a CSV file", type=['csv'])
+    if uploaded_csv is None:
+        return
     
-    2. **TIN Validation:** Always verify the landlord's TIN with TRA to ensure they're properly registered.
+    import pandas as pd
     
-    3. **Service Charges:** If the invoice includes service charges (cleaning, security, etc.), these may 
-       also be subject to 10% WHT as separate items.
+    try:
+        # Amounts are read as text and converted with Decimal, so they round
+        # exactly like single invoices; blank lines are kept (and dropped
+        # below) so the index still maps to the CSV line number
+        invoices = pd.read_csv(
+            uploaded_csv,
+            dtype={'base_rent': str, 'vat_amount': str},
+            skip_blank_lines=False,
+        ).dropna(how='all')
+    except Exception as e:
+        st.error(f"CSV Error: {str(e)}")
+        return
     
-    4. **VAT Registration:** Confirm the landlord is VAT-registered and the VAT shown is legitimate. 
-       Request VAT certificate if needed.
+    missing = [column for column in ('base_rent', 'vat_amount') if column not in invoices.columns]
+    if missing:
+        st.error(f"❌ Missing required column(s): {', '.join(missing)}")
+        return
     
-    5. **WHT Certificate:** After remitting WHT to TRA, obtain and provide the WHT certificate to the 
-       landlord within the required timeframe.
+    cents = invoices[['base_rent', 'vat_amount']].apply(lambda column: column.map(_parse_cents))
+    invalid = cents.isna().any(axis=1)
+    if invalid.any():
+        rows = ", ".join(str(i + 2) for i in invoices.index[invalid])  # +2: header row, 1-based
+        st.error(f"❌ Missing, invalid, negative or out-of-range amounts on CSV line(s): {rows}")
+        return
     
-    6. **Record Keeping:** Maintain copies of:
-       - Original invoice
-       - Bank transfer receipts
-       - TRA payment confirmation
-       - WHT certificates
+    cents = cents.astype('int64')
+    results = TaxCalculator.calculate_batch(pd.DataFrame({
+        'gross_cents': cents['base_rent'],
+        'vat_cents': cents['vat_amount'],
+    }))
     
-    7. **Monthly Returns:** Remember to file your monthly WHT return with TRA, declaring all rent payments.
+    table = invoices.drop(columns=['base_rent', 'vat_amount'])
+    table['Base Rent'] = cents['base_rent'] / 100
+    table['VAT'] = cents['vat_amount'] / 100
+    table['WHT (to TRA)'] = results['wht_cents'] / 100
+    table['To Landlord'] = results['payment_to_landlord_cents'] / 100
+    table['Total Outflow'] = results['total_outflow_cents'] / 100
     
-    8. **Professional Advice:** This tool provides calculations only. For complex situations or large 
-       amounts, consult a qualified tax accountant or advisor.
+    amount_format = st.column_config.NumberColumn(format="%.2f")
+    st.dataframe(
+        table,
+        use_container_width=True,
+        column_config={column: amount_format for column in table.columns[-5:]}
+    )
     
-    9. **Residential vs Commercial:** These rules apply to **commercial** rent only. Residential rent 
-       has different tax treatment in Tanzania.
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Transfer to Landlords",
+                  format_currency(_from_cents(sum(results['payment_to_landlord_cents'].tolist()))))
+    with col2:
+        st.metric("Remit to TRA (WHT)",
+                  format_currency(_from_cents(sum(results['wht_cents'].tolist()))))
+    with col3:
+        st.metric("Total Cash Outflow",
+                  format_currency(_from_cents(sum(results['total_outflow_cents'].tolist()))))
     
-    10. **Exchange Rates:** If invoice shows USD equivalent, use TRA's official exchange rate for the 
-        transaction date if you need to report in foreign currency.
-    """)
-    st.markdown('</div>', unsafe_allow_html=True)
+    display_compliance_warnings()
 
 
 def main():
@@ -663,8 +967,8 @@ def main():
         
         input_method = st.radio(
             "Choose input method:",
-            ["Upload Invoice (Image/PDF)", "Manual Entry"],
-            help="Upload an invoice file or enter details manually"
+            ["Upload Invoice (Image/PDF)", "Manual Entry", "Batch Upload (CSV)"],
+            help="Upload an invoice file, enter details manually, or process a CSV of invoices"
         )
         
         st.markdown("---")
@@ -699,16 +1003,20 @@ def main():
         if uploaded_file is not None:
             # Display uploaded file
             file_type = uploaded_file.type
+            file_bytes = uploaded_file.getvalue()
             
             with st.spinner("Processing invoice..."):
                 # Extract text based on file type
                 if file_type.startswith('image'):
                     # Image file
-                    image = Image.open(uploaded_file)
-                    st.image(image, caption="Uploaded Invoice", use_container_width=True)
+                    st.image(file_bytes, caption="Uploaded Invoice", use_container_width=True)
                     
                     with st.expander("🔍 View OCR Extracted Text"):
-                        raw_text = OCRProcessor.extract_from_image(image)
+                        try:
+                            raw_text = OCRProcessor.extract_from_image(file_bytes)
+                        except Exception as e:
+                            st.error(f"OCR Error: {str(e)}")
+                            raw_text = ""
                         st.text_area("Raw Text", raw_text, height=200)
                     
                 elif file_type == 'application/pdf':
@@ -716,7 +1024,21 @@ def main():
                     st.success("PDF uploaded successfully")
                     
                     with st.expander("🔍 View Extracted Text"):
-                        raw_text = OCRProcessor.extract_from_pdf(uploaded_file)
+                        try:
+                            raw_text, ocr_failures = OCRProcessor.extract_from_pdf(file_bytes)
+                        except Exception as e:
+                            st.error(f"PDF Extraction Error: {str(e)}")
+                            raw_text, ocr_failures = "", []
+                        
+                        if ocr_failures:
+                            st.warning("⚠️ Some pages could not be read and were skipped: "
+                                       + "; ".join(ocr_failures))
+                            # Partial results are cached like any other, so OCR
+                            # is only retried on request; pages that were read
+                            # come back from the per-page cache
+                            if st.button("Retry unreadable pages"):
+                                OCRProcessor.extract_from_pdf.clear()
+                                st.rerun()
                         st.text_area("Raw Text", raw_text, height=200)
                 else:
                     st.error("Unsupported file type")
@@ -755,6 +1077,10 @@ def main():
                 else:
                     st.error("❌ Could not extract text from the file. Please try manual entry or upload a clearer image.")
     
+    elif input_method == "Batch Upload (CSV)":
+        st.markdown("---")
+        batch_processing_form()
+    
     else:  # Manual Entry
         st.markdown("---")
         invoice = manual_input_form()
@@ -3,211 +3,342 @@ Test script for Tanzanian Rent Invoice Tax Calculations
 Run this to verify calculations are correct
 """
 
-from decimal import Decimal
-
-# Import calculator from main app
+import os
+import random
+import re
 import sys
-sys.path.append('.')
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 
-def test_basic_calculation():
-    """Test basic WHT calculation"""
-    print("=" * 60)
-    print("TEST 1: Basic WHT Calculation")
-    print("=" * 60)
-    
-    base_rent = Decimal("5000000.00")  # TZS 5M
-    vat_rate = Decimal("0.18")
-    wht_rate = Decimal("0.10")
-    
-    vat_amount = base_rent * vat_rate
-    total_invoice = base_rent + vat_amount
-    
-    wht = base_rent * wht_rate
-    payment_to_landlord = (base_rent - wht) + vat_amount
-    payment_to_tra = wht
-    total_outflow = payment_to_landlord + payment_to_tra
-    
-    print(f"Base Rent: TZS {base_rent:,.2f}")
-    print(f"VAT @ 18%: TZS {vat_amount:,.2f}")
-    print(f"Total Invoice: TZS {total_invoice:,.2f}")
-    print()
-    print(f"WHT (10% of base): TZS {wht:,.2f}")
-    print(f"Payment to Landlord: TZS {payment_to_landlord:,.2f}")
-    print(f"  = (TZS {base_rent:,.2f} - TZS {wht:,.2f}) + TZS {vat_amount:,.2f}")
-    print(f"Payment to TRA: TZS {payment_to_tra:,.2f}")
-    print(f"Total Outflow: TZS {total_outflow:,.2f}")
-    print()
-    
-    # Verify
-    assert total_outflow == total_invoice, "Total outflow should match invoice total"
-    print("✅ PASS: Total outflow matches invoice")
-    print()
+# Importing the app runs it in Streamlit "bare mode": st.* calls are no-ops
+import app
+from app import InvoiceParser, TaxCalculator, _to_cents
 
+# pytest is optional: `python test_calculations.py` runs the same cases
+try:
+    import pytest
+except ImportError:
+    pytest = None
 
-def test_small_amount():
-    """Test with smaller amount"""
-    print("=" * 60)
-    print("TEST 2: Small Amount Calculation")
-    print("=" * 60)
-    
-    base_rent = Decimal("500000.00")  # TZS 500K
-    vat_rate = Decimal("0.18")
-    wht_rate = Decimal("0.10")
-    
-    vat_amount = base_rent * vat_rate
-    total_invoice = base_rent + vat_amount
-    
-    wht = base_rent * wht_rate
-    payment_to_landlord = (base_rent - wht) + vat_amount
-    payment_to_tra = wht
-    total_outflow = payment_to_landlord + payment_to_tra
-    
-    print(f"Base Rent: TZS {base_rent:,.2f}")
-    print(f"VAT @ 18%: TZS {vat_amount:,.2f}")
-    print(f"Total Invoice: TZS {total_invoice:,.2f}")
-    print()
-    print(f"WHT (10% of base): TZS {wht:,.2f}")
-    print(f"Payment to Landlord: TZS {payment_to_landlord:,.2f}")
-    print(f"Payment to TRA: TZS {payment_to_tra:,.2f}")
-    print(f"Total Outflow: TZS {total_outflow:,.2f}")
-    print()
-    
-    assert total_outflow == total_invoice, "Total outflow should match invoice total"
-    print("✅ PASS: Total outflow matches invoice")
-    print()
+# Section separator used throughout the report
+_BAR = "=" * 60
 
 
-def test_large_amount():
-    """Test with large amount"""
-    print("=" * 60)
-    print("TEST 3: Large Amount Calculation")
-    print("=" * 60)
-    
-    base_rent = Decimal("50000000.00")  # TZS 50M
-    vat_rate = Decimal("0.18")
-    wht_rate = Decimal("0.10")
+@lru_cache(maxsize=32)
+def _compute(base_rent, vat_rate, wht_rate):
+    """
+    Compute the invoice and payment split for one base rent.
     
-    vat_amount = base_rent * vat_rate
+    Amounts are integer cents (1/100 TZS) and rates are (numerator,
+    denominator) pairs, so every result is exact. Returns (vat_amount,
+    total_invoice, wht, payment_to_landlord, total_outflow).
+    """
+    vat_amount = base_rent * vat_rate[0] // vat_rate[1]
     total_invoice = base_rent + vat_amount
     
-    wht = base_rent * wht_rate
+    wht = base_rent * wht_rate[0] // wht_rate[1]
     payment_to_landlord = (base_rent - wht) + vat_amount
-    payment_to_tra = wht
-    total_outflow = payment_to_landlord + payment_to_tra
-    
-    print(f"Base Rent: TZS {base_rent:,.2f}")
-    print(f"VAT @ 18%: TZS {vat_amount:,.2f}")
-    print(f"Total Invoice: TZS {total_invoice:,.2f}")
-    print()
-    print(f"WHT (10% of base): TZS {wht:,.2f}")
-    print(f"Payment to Landlord: TZS {payment_to_landlord:,.2f}")
-    print(f"Payment to TRA: TZS {payment_to_tra:,.2f}")
-    print(f"Total Outflow: TZS {total_outflow:,.2f}")
-    print()
-    
-    assert total_outflow == total_invoice, "Total outflow should match invoice total"
-    print("✅ PASS: Total outflow matches invoice")
-    print()
+    total_outflow = payment_to_landlord + wht
+    return vat_amount, total_invoice, wht, payment_to_landlord, total_outflow
 
 
-def test_azura_beach_club_example():
-    """Test with Azura Beach Club invoice example from requirements"""
-    print("=" * 60)
-    print("TEST 4: Real-World Example - Azura Beach Club")
-    print("=" * 60)
-    
-    # Assuming TZS 10M base rent for this example
-    base_rent = Decimal("10000000.00")
-    vat_rate = Decimal("0.18")
-    wht_rate = Decimal("0.10")
+# Per-case report, filled in by _run_case
+_REPORT = (
+    _BAR + "\n"
+    "TEST {number}: {name}\n"
+    + _BAR + "\n"
+    "Base Rent: {base_rent}\n"
+    "{vat_label}: {vat_amount}\n"
+    "Total Invoice: {total_invoice}\n"
+    "\n"
+    "{wht_label}: {wht}\n"
+    "Payment to Landlord: {payment_to_landlord}\n"
+    "  = ({base_rent} - {wht}) + {vat_amount}\n"
+    "Payment to TRA: {payment_to_tra}\n"
+    "Total Outflow: {total_outflow}\n"
+    "\n"
+    "{verdict}\n"
+    "\n"
+)
+_PASS = "✅ PASS: Total outflow matches invoice"
+_FAIL = "❌ FAIL: Total outflow does not match invoice"
+
+
+def _fmt(cents):
+    """Format integer cents as 'TZS 1,234.56'"""
+    whole, frac = divmod(cents, 100)
+    return f"TZS {whole:,}.{frac:02d}"
+
+
+# Rates as (numerator, denominator) pairs, built once at import
+_VAT_RATE = (18, 100)
+_WHT_RATE = (10, 100)
+_ZERO_RATE = (0, 100)
+
+# (name, base rent in cents, VAT rate, WHT rate)
+CASES = (
+    ("Basic WHT Calculation", 500_000_000, _VAT_RATE, _WHT_RATE),  # TZS 5M
+    ("Small Amount Calculation", 50_000_000, _VAT_RATE, _WHT_RATE),  # TZS 500K
+    ("Large Amount Calculation", 5_000_000_000, _VAT_RATE, _WHT_RATE),  # TZS 50M
+    # Azura Beach Club invoice example from requirements, assuming TZS 10M base rent
+    ("Real-World Example - Azura Beach Club", 1_000_000_000, _VAT_RATE, _WHT_RATE),
+    # Zero VAT shouldn't happen for commercial rent but is a useful edge case
+    ("Edge Case - Zero VAT", 100_000_000, _ZERO_RATE, _WHT_RATE),  # TZS 1M
+)
+
+
+def _run_case(number, name, base_rent, vat_rate, wht_rate):
+    """Print the payment split for one case; returns (total_outflow, total_invoice)"""
+    vat_amount, total_invoice, wht, payment_to_landlord, total_outflow = _compute(
+        base_rent, vat_rate, wht_rate
+    )
+    passed = total_outflow == total_invoice
     
-    vat_amount = base_rent * vat_rate
-    total_invoice = base_rent + vat_amount
+    # One format pass and a single stdout write per case
+    sys.stdout.write(_REPORT.format_map({
+        "number": number,
+        "name": name,
+        "vat_label": f"VAT @ {vat_rate[0] * 100 // vat_rate[1]}%" if vat_rate[0] else "VAT",
+        "wht_label": f"WHT ({wht_rate[0] * 100 // wht_rate[1]}% of base)",
+        "base_rent": _fmt(base_rent),
+        "vat_amount": _fmt(vat_amount),
+        "total_invoice": _fmt(total_invoice),
+        "wht": _fmt(wht),
+        "payment_to_landlord": _fmt(payment_to_landlord),
+        "payment_to_tra": _fmt(wht),
+        "total_outflow": _fmt(total_outflow),
+        "verdict": _PASS if passed else _FAIL,
+    }))
+    return total_outflow, total_invoice
+
+
+def _check_case(number, case):
+    """Run one case and return (name, ok, error message)"""
+    name = case[0]
+    try:
+        total_outflow, total_invoice = _run_case(number, *case)
+    except Exception as e:
+        return name, False, f"{type(e).__name__}: {e}"
+    if total_outflow != total_invoice:
+        return name, False, "Total outflow should match invoice total"
+    return name, True, None
+
+
+if pytest is not None:
+    @pytest.mark.parametrize("number, case", list(enumerate(CASES, start=1)), ids=[case[0] for case in CASES])
+    def test_case(number, case):
+        """Each case's total outflow matches its invoice total"""
+        name, ok, error = _check_case(number, case)
+        assert ok, f"{name}: {error}"
+
+
+# --- app.py tests: cent arithmetic, VAT check, batch and parser ---
+
+SAMPLE_INVOICES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SAMPLE_INVOICES.md")
+CENT = Decimal("0.01")
+
+
+def _quantize(amount):
+    """Round to cents half-up, as TaxCalculator did before integer cents"""
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def test_half_up_rounding():
+    """Cent kernels round half-up exactly like the Decimal/quantize formulas"""
+    # Half-cent ties round away from zero
+    assert _to_cents(Decimal("0.285")) == 29
+    assert _to_cents(Decimal("1000.005")) == 100001
+    assert _to_cents(Decimal("-0.005")) == -1
+    assert TaxCalculator.calculate_wht(Decimal("0.05")) == Decimal("0.01")
+    assert TaxCalculator.calculate_wht(Decimal("0.04")) == Decimal("0.00")
     
-    wht = base_rent * wht_rate
-    payment_to_landlord = (base_rent - wht) + vat_amount
-    payment_to_tra = wht
-    total_outflow = payment_to_landlord + payment_to_tra
+    # InvoiceData keeps integer cents in step with its Decimal amounts
+    invoice = app.InvoiceData()
+    assert invoice.base_rent_cents is None
+    invoice.base_rent_tzs = Decimal("0.285")
+    assert invoice.base_rent_cents == 29
+    invoice.base_rent_tzs = None
+    assert invoice.base_rent_cents is None
     
-    print(f"Base Rent: TZS {base_rent:,.2f}")
-    print(f"VAT @ 18%: TZS {vat_amount:,.2f}")
-    print(f"Total Invoice: TZS {total_invoice:,.2f}")
-    print()
-    print("Breakdown:")
-    print(f"  WHT (10% of base): TZS {wht:,.2f}")
-    print(f"  Net Rent: TZS {base_rent - wht:,.2f}")
-    print(f"  VAT passed through: TZS {vat_amount:,.2f}")
-    print()
-    print(f"✓ Transfer to Azura Beach Club Ltd: TZS {payment_to_landlord:,.2f}")
-    print(f"✓ Remit to TRA: TZS {payment_to_tra:,.2f}")
-    print(f"✓ Total Tenant Outflow: TZS {total_outflow:,.2f}")
-    print()
+    rng = random.Random(2026)
+    for _ in range(20000):
+        gross = Decimal(rng.randrange(0, 10**12)).scaleb(-2)
+        vat = Decimal(rng.randrange(0, 10**11)).scaleb(-2)
+        wht = TaxCalculator.calculate_wht(gross)
+        assert wht == _quantize(gross * TaxCalculator.WHT_RATE), gross
+        payment = TaxCalculator.calculate_payment_to_landlord(gross, vat, wht)
+        assert payment == _quantize((gross - wht) + vat), (gross, vat)
+        assert TaxCalculator.calculate_total_outflow(payment, wht) == _quantize(payment + wht)
+
+
+def _reference_vat_rate(vat, base):
+    """The Decimal VAT-rate check TaxCalculator used before basis points"""
+    if base == 0:
+        return Decimal("0"), False
+    rate = (vat / base).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+    return rate, abs(rate - TaxCalculator.VAT_RATE_STANDARD) < Decimal("0.01")
+
+
+def test_vat_rate_tolerance_edges():
+    """The +/-1% VAT tolerance is exclusive, applied after rounding to 0.01%"""
+    base = Decimal("100000.00")
+    for vat, expected in (
+        ("17000.00", False),  # exactly 17%
+        ("17004.99", False),  # rounds to 17.00%
+        ("17005.00", True),   # rounds to 17.01%
+        ("18000.00", True),
+        ("18995.00", False),  # rounds to 19.00%
+        ("18994.99", True),   # rounds to 18.99%
+        ("19000.00", False),  # exactly 19%
+    ):
+        rate, is_standard = TaxCalculator.verify_vat_rate(Decimal(vat), base)
+        assert is_standard is expected, vat
+        assert (rate, is_standard) == _reference_vat_rate(Decimal(vat), base), vat
+    assert TaxCalculator.verify_vat_rate(Decimal("1.00"), Decimal("0")) == (Decimal("0"), False)
     
-    assert total_outflow == total_invoice, "Total outflow should match invoice total"
-    print("✅ PASS: Calculation verified")
-    print()
+    rng = random.Random(18)
+    for _ in range(50000):
+        base = Decimal(rng.randrange(1, 10**10)).scaleb(-2)
+        vat = _quantize(base * Decimal(rng.randrange(1500, 2100)) / 10000)
+        assert TaxCalculator.verify_vat_rate(vat, base) == _reference_vat_rate(vat, base), (vat, base)
 
 
-def test_edge_case_zero_vat():
-    """Test edge case with zero VAT (shouldn't happen for commercial but good to test)"""
-    print("=" * 60)
-    print("TEST 5: Edge Case - Zero VAT")
-    print("=" * 60)
+def test_calculate_batch_matches_scalar():
+    """calculate_batch agrees with the scalar cent kernels row by row"""
+    import pandas as pd
     
-    base_rent = Decimal("1000000.00")
-    vat_amount = Decimal("0.00")
-    wht_rate = Decimal("0.10")
+    # CSV amounts round like single invoices; out-of-range values are rejected
+    assert app._parse_cents("0.285") == 29
+    assert app._parse_cents("1,000.005") == 100001
+    assert app._parse_cents("1e300") is None
+    assert app._parse_cents("-1") is None
+    assert app._parse_cents(str(TaxCalculator.BATCH_MAX_CENTS + 1)) is None
     
-    total_invoice = base_rent + vat_amount
+    rng = random.Random(10)
+    gross = [0, 1, 4, 5, 15, 25, TaxCalculator.BATCH_MAX_CENTS] + [rng.randrange(0, 10**14) for _ in range(5000)]
+    vat = [0, 0, 1, 0, 3, 5, TaxCalculator.BATCH_MAX_CENTS] + [rng.randrange(0, 10**13) for _ in range(5000)]
+    results = TaxCalculator.calculate_batch(pd.DataFrame({'gross_cents': gross, 'vat_cents': vat}))
     
-    wht = base_rent * wht_rate
-    payment_to_landlord = (base_rent - wht) + vat_amount
-    payment_to_tra = wht
-    total_outflow = payment_to_landlord + payment_to_tra
+    for gross_cents, vat_cents, row in zip(gross, vat, results.itertuples(index=False)):
+        wht = TaxCalculator.calculate_wht_cents(gross_cents)
+        payment = TaxCalculator.calculate_payment_to_landlord_cents(gross_cents, vat_cents, wht)
+        assert row.wht_cents == wht, gross_cents
+        assert row.payment_to_landlord_cents == payment, (gross_cents, vat_cents)
+        assert row.total_outflow_cents == TaxCalculator.calculate_total_outflow_cents(payment, wht)
+
+
+# Fields each SAMPLE_INVOICES.md sample is expected to yield
+SAMPLE_FIELDS = (
+    {
+        'invoice_number': 'INV-2026-001',
+        'invoice_date': '15 January 2026',
+        'rent_period': 'January 2026',
+        'base_rent_tzs': Decimal("5000000.00"),
+        'vat_rate': Decimal("0.18"),
+        'vat_amount_tzs': Decimal("900000.00"),
+        'total_amount_tzs': Decimal("5900000.00"),
+        'landlord_bank': 'CRDB Bank',
+        'landlord_account': '0150-123456-00',
+    },
+    {
+        'invoice_number': 'TP-2026-002',
+        'invoice_date': '20/01/2026',
+        'rent_period': 'February 2026',
+        'vat_rate': Decimal("0.18"),
+        'vat_amount_tzs': Decimal("1980000.00"),
+    },
+    {
+        'invoice_date': '10 Jan 2026',
+        'rent_period': 'January 2026',
+        'total_amount_tzs': Decimal("590000"),
+    },
+    {
+        'invoice_date': '25 January 2026',
+        'rent_period': 'January 2026',
+        'description': 'Description: Executive Office Suite - 5th Floor',
+        'vat_rate': Decimal("0.18"),
+        'vat_amount_tzs': Decimal("3600000.00"),
+        'usd_equivalent': 'USD 8,000',
+    },
+)
+
+
+def test_parse_sample_invoices():
+    """parse_invoice extracts the expected fields from SAMPLE_INVOICES.md"""
+    with open(SAMPLE_INVOICES_PATH, encoding="utf-8") as sample_file:
+        samples = re.findall(r'```\n(.*?)```', sample_file.read(), re.S)
+    assert len(samples) == len(SAMPLE_FIELDS)
     
-    print(f"Base Rent: TZS {base_rent:,.2f}")
-    print(f"VAT: TZS {vat_amount:,.2f}")
-    print(f"Total Invoice: TZS {total_invoice:,.2f}")
-    print()
-    print(f"WHT (10% of base): TZS {wht:,.2f}")
-    print(f"Payment to Landlord: TZS {payment_to_landlord:,.2f}")
-    print(f"Payment to TRA: TZS {payment_to_tra:,.2f}")
-    print(f"Total Outflow: TZS {total_outflow:,.2f}")
-    print()
+    for number, (text, expected) in enumerate(zip(samples, SAMPLE_FIELDS), start=1):
+        invoice = InvoiceParser.parse_invoice(text)
+        for field, value in expected.items():
+            assert getattr(invoice, field) == value, f"Sample {number} {field}: {getattr(invoice, field)!r}"
     
-    assert total_outflow == total_invoice, "Total outflow should match invoice total"
-    print("✅ PASS: Edge case handled correctly")
-    print()
+    # Sample 1 is complete and consistent
+    assert InvoiceParser.validate_invoice(InvoiceParser.parse_invoice(samples[0])) == (True, [])
+
+
+def test_parse_line_breaks():
+    """parse_invoice treats CR, CRLF, vertical tab and form feed as line breaks"""
+    lines = ["Invoice No: INV-2026-001", "Payee: Azura Beach Club Limited",
+             "Bank: CRDB", "Account: 123-45", "VAT @ 18% TZS 900,000.00"]
+    for separator in ("\n", "\r", "\r\n", "\x0b", "\x0c"):
+        invoice = InvoiceParser.parse_invoice(separator.join(lines))
+        assert invoice.landlord_name == "Azura Beach Club Limited", repr(separator)
+        assert invoice.landlord_bank == "CRDB", repr(separator)
+        assert invoice.landlord_account == "123-45", repr(separator)
+
+
+APP_TESTS = (
+    test_half_up_rounding,
+    test_vat_rate_tolerance_edges,
+    test_calculate_batch_matches_scalar,
+    test_parse_sample_invoices,
+    test_parse_line_breaks,
+)
+
+
+def _check_app_test(test):
+    """Run one app.py test and return (name, ok, error message)"""
+    try:
+        test()
+    except Exception as e:
+        return test.__name__, False, f"{type(e).__name__}: {e}"
+    print(f"✅ PASS: {test.__doc__}")
+    return test.__name__, True, None
 
 
 def run_all_tests():
     """Run all tests"""
-    print("\n" + "=" * 60)
+    print("\n" + _BAR)
     print("TANZANIAN RENT INVOICE TAX CALCULATOR - TEST SUITE")
-    print("=" * 60 + "\n")
+    print(_BAR + "\n")
     
-    try:
-        test_basic_calculation()
-        test_small_amount()
-        test_large_amount()
-        test_azura_beach_club_example()
-        test_edge_case_zero_vat()
-        
-        print("=" * 60)
+    # Every case runs, so one failure doesn't hide the rest
+    results = [_check_case(number, case) for number, case in enumerate(CASES, start=1)]
+    print(_BAR)
+    print("APP.PY TESTS")
+    print(_BAR)
+    results += [_check_app_test(test) for test in APP_TESTS]
+    print()
+    failures = [(name, error) for name, ok, error in results if not ok]
+    
+    if not failures:
+        print(_BAR)
         print("ALL TESTS PASSED! ✅")
-        print("=" * 60)
+        print(_BAR)
         print()
         print("The tax calculation logic is working correctly.")
         print("You can now run the Streamlit app with confidence:")
         print("  streamlit run app.py")
         print()
-        
-    except AssertionError as e:
+    else:
         print()
-        print("=" * 60)
-        print("TEST FAILED! ❌")
-        print("=" * 60)
-        print(f"Error: {e}")
+        print(_BAR)
+        print(f"{len(failures)} OF {len(results)} TESTS FAILED! ❌")
+        print(_BAR)
+        for name, error in failures:
+            print(f"Error in {name}: {error}")
         print()
 
 